@@ -12,25 +12,11 @@
 
 # %%
 import contextlib
+import functools
 from random import random
 from time import perf_counter, sleep
 
 # %%
-def cached_property(func):
-    """decorator used to cache expensive object attribute lookup"""
-    name = f"_cached_{func.__name__}"
-
-    @property
-    def lookup(instance):
-        if hasattr(instance, name):
-            return getattr(instance, name)
-        value = func(instance)
-        setattr(instance, name, value)
-        return value
-
-    return lookup
-
-
 class Planet:
     """the nicest little orb this side of Orion's Belt"""
 
@@ -44,7 +30,7 @@ class Planet:
     def __repr__(self):
         return f"{self.__class__.__name__}({repr(self.color)})"
 
-    @cached_property
+    @functools.cached_property
     def mass(self):
         scale_factor = random()
         sleep(self.TEMPORAL_SHIFT)
@@ -1,3 +1,19 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def _round_half_up(value):
+    """Round a Decimal half up to a whole number."""
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _percentage_of(cents, rate):
+    """Return rate percent of cents, rounded half up to a whole cent."""
+    return _round_half_up(cents * rate / 100)
+
+
+def _dollars(cents):
+    """Convert integer cents to an exact Decimal with 2 decimal places."""
+    return Decimal(cents).scaleb(-2)
 
 
 def check_split(item_total, tax_rate, tip, people):
@@ -9,38 +25,24 @@ def check_split(item_total, tax_rate, tip, people):
        :param people: int (e.g. 3)
 
        :return: tuple of (grand_total: str, splits: list)
-                e.g. ('$10.00', [3.34, 3.33, 3.33])
+                e.g. ('$10.00', [Decimal('3.34'), Decimal('3.33'), Decimal('3.33')])
     """
-    
-    # get the numbers from the strings
-    item_total = float(item_total.strip('$'))
-    tax_rate = float(tax_rate.strip('%')) / 100
-    tip = float(tip.strip('%')) / 100
-    print(item_total, tax_rate, tip, people)
-
-    # calculate the grand total
-    grand_total = (item_total * (1 + tax_rate)) * (1 + tip)
-    print(grand_total)
-
-    # calculate the split
-    split = grand_total / people
-
-    # round the split to 2 decimal places
-    split = round(split, 2)
-
-    # create a list of the splits
-    splits = [split] * people
 
-    # add the difference to the first split
-    splits[0] += round(grand_total - split * people, 2)
+    # get the numbers from the strings, money in cents and exact percentages
+    item_total = _round_half_up(Decimal(item_total.strip('$')) * 100)
+    tax_rate = Decimal(tax_rate.strip('%'))
+    tip = Decimal(tip.strip('%'))
 
-    grand_total = round(grand_total, 2)
+    # calculate the grand total, tax and tip are each rounded to the cent
+    subtotal = item_total + _percentage_of(item_total, tax_rate)
+    grand_total = subtotal + _percentage_of(subtotal, tip)
 
-    assert grand_total == sum(splits)
-    print(grand_total, splits)
+    # split evenly, the first split absorbs the remaining cents
+    split, remainder = divmod(grand_total, people)
+    splits = [_dollars(split + remainder)] + [_dollars(split)] * (people - 1)
 
     # convert the grand total to a string
-    grand_total = f'${grand_total}'
+    grand_total = f'${_dollars(grand_total)}'
 
     return grand_total, splits
 
@@ -16,6 +16,9 @@ from main import check_split
     (('$16.99', '10%', '20%', 2), '$22.43'),
     (('$16.99', '10%', '20%', 3), '$22.43'),
     (('$16.99', '10%', '20%', 4), '$22.43'),
+    (('$100.00', '8.875%', '0%', 1), '$108.88'),
+    (('$1000.00', '0.125%', '0%', 1), '$1001.25'),
+    (('$10.005', '0%', '0%', 2), '$10.01'),
 ])
 def test_check_split(args, expected):
     grand_total, splits = check_split(*args)
@@ -21,12 +21,17 @@ quotes = [
 ]
 
 
+# indexes kept in sync with quotes for constant time lookups
+quotes_by_id = {quote["id"]: quote for quote in quotes}
+quote_ids = {quote["quote"]: quote["id"] for quote in quotes}
+
+
 def _get_quote(qid):
-    return [quote for quote in quotes if quote["id"] == qid]
+    return quotes_by_id.get(qid)
 
 
 def _quote_exists(existing_quote):
-    return [quote for quote in quotes if quote["quote"] == existing_quote]
+    return existing_quote in quote_ids
 
 
 @app.route("/api/quotes", methods=["GET"])
@@ -37,10 +42,10 @@ def get_quotes():
 @app.route("/api/quotes/<int:qid>", methods=["GET"])
 def get_quote(qid):
     quote = _get_quote(qid)
-    if not quote:
+    if quote is None:
         abort(404)
 
-    return {"quotes": quote}
+    return {"quotes": [quote]}
 
 
 @app.route("/api/quotes", methods=["POST"])
@@ -53,12 +58,18 @@ def create_quote():
     if quote is None or movie is None:
         abort(400)
 
+    # the text is looked up in a dict, it must be hashable
+    if not isinstance(quote, str):
+        abort(400)
+
     if _quote_exists(quote):
         abort(400)
 
     last_quote_id = quotes[-1].get("id", 0)
     new_quote = dict(id=last_quote_id + 1, quote=quote, movie=movie)
     quotes.append(new_quote)
+    quotes_by_id[new_quote["id"]] = new_quote
+    quote_ids[quote] = new_quote["id"]
 
     return {"quote": new_quote}, 201
 
@@ -68,12 +79,18 @@ def update_quote(qid):
     if not request.json:
         abort(400)
 
-    matching_quotes = _get_quote(qid)
-    if len(matching_quotes) != 1:
+    update_quote = _get_quote(qid)
+    if update_quote is None:
         abort(404)
 
-    update_quote = matching_quotes[0]
-    update_quote["quote"] = request.json.get("quote") or update_quote["quote"]
+    # the new text must be a string and can't be the one of another quote
+    new_text = request.json.get("quote") or update_quote["quote"]
+    if not isinstance(new_text, str) or quote_ids.get(new_text, qid) != qid:
+        abort(400)
+
+    del quote_ids[update_quote["quote"]]
+    update_quote["quote"] = new_text
+    quote_ids[new_text] = qid
     update_quote["movie"] = request.json.get("movie") or update_quote["movie"]
 
     return {"quote": update_quote}, 200
@@ -81,9 +98,11 @@ def update_quote(qid):
 
 @app.route("/api/quotes/<int:qid>", methods=["DELETE"])
 def delete_quote(qid):
-    del_quote = _get_quote(qid)
-    if len(del_quote) != 1:
+    del_quote = quotes_by_id.pop(qid, None)
+    if del_quote is None:
         abort(404)
 
-    quotes.remove(del_quote[0])
+    # still a linear scan, the list keeps the order returned by GET /api/quotes
+    quotes.remove(del_quote)
+    del quote_ids[del_quote["quote"]]
     return {}, 204
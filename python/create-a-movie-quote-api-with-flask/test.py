@@ -70,6 +70,14 @@ def test_create_quote_incomplete_data():
     assert response.status_code == 400
 
 
+def test_create_quote_not_a_string():
+    new_quote = dict(quote=["You talking to me?"], movie="Taxi driver")
+    response = client.post(
+        API_ENDPOINT, data=json.dumps(new_quote), content_type="application/json"
+    )
+    assert response.status_code == 400
+
+
 def test_create_existing_quote():
     new_quote = dict(quote="You talking to me?", movie="Taxi driver")
     response = client.post(
@@ -95,6 +103,32 @@ def test_update_quote():
     assert updated_quote["movie"] == "Taxi driver (1976)"
 
 
+def test_update_existing_quote():
+    update_quote = dict(quote="Get to the choppa!")
+    response = client.put(
+        f"{API_ENDPOINT}/4",
+        data=json.dumps(update_quote),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+
+    response = client.get(f"{API_ENDPOINT}/4")
+    data = json.loads(response.get_data())
+    assert data["quotes"][0]["quote"] == "You talking to me?!"
+
+
+def test_update_quote_not_a_string():
+    update_quote = dict(quote={"text": "You talking to me?!"})
+    response = client.put(
+        f"{API_ENDPOINT}/4",
+        data=json.dumps(update_quote),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+
+
 def test_update_no_data():
     update_quote = {}
     response = client.put(
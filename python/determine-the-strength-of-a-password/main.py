@@ -1,4 +1,33 @@
-import re
+import string
+
+# bit flags describing which character classes a password contains
+_LOWER = 1
+_UPPER = 2
+_DIGIT = 4
+_SPECIAL = 8
+_LETTER = 16
+
+# every character that is not an ascii letter or digit is also a special one
+_CHAR_CLASSES = {
+    **dict.fromkeys(string.ascii_lowercase, _LOWER | _LETTER),
+    **dict.fromkeys(string.ascii_uppercase, _UPPER | _LETTER),
+    **dict.fromkeys(string.digits, _DIGIT),
+}
+
+
+def _other_class(char):
+    """Flags of a character that is not an ascii letter or digit."""
+    flags = _SPECIAL
+
+    # like \d, decimal digits of any script are numbers, e.g. '٣'
+    if char.isdecimal():
+        flags |= _DIGIT
+
+    # a few characters lower to an ascii letter, e.g. the Kelvin sign to 'k'
+    if any(lower in string.ascii_lowercase for lower in char.lower()):
+        flags |= _LETTER
+
+    return flags
 
 
 def password_complexity(password):  # sourcery skip: hoist-repeated-if-condition
@@ -12,28 +41,28 @@ def password_complexity(password):  # sourcery skip: hoist-repeated-if-condition
 
        return: score int"""
 
+    # classify every character in a single pass over the password
+    flags = 0
+    for char in password:
+        flags |= _CHAR_CLASSES.get(char) or _other_class(char)
+
     score = 0
 
-    if re.search(r"[A-Z]+", password) and re.search(r"[a-z]+", password):
+    if flags & _UPPER and flags & _LOWER:
         score += 1
 
-    if re.search(r"[a-z]+", password.lower()) and re.search(r"\d+", password):
+    if flags & _LETTER and flags & _DIGIT:
         score += 1
 
-    if re.search("[^A-Za-z0-9]+", password):
+    if flags & _SPECIAL:
         score += 1
 
+    # the repeated characters check only matters for long enough passwords
     if len(password) >= 8:
         score += 1
 
-    # (.)(\1{1,}):
-    #   - . = any character
-    #   - (.) = capture group 1
-    #   - \1 = first capture group
-    #   - {1,} = 1 or more times
-    #   - \1{1,} = the previous capture group 1 or more times (greedy)
-    #   - (\1{1,}) = a capture group of the previous capture group repeated 1 or more times (greedy)
-    if len(password) >= 8 and not re.search(r"(.)(\1{1,})", password):
-        score += 1
+        # like the (.) of a regex, a newline never counts as a repeat
+        if not any(a == b != "\n" for a, b in zip(password, password[1:])):
+            score += 1
 
     return score
@@ -29,6 +29,9 @@ from main import password_complexity
     ('123$Abc1', 5),
     ('@@@@@@@@@@', 2),
     ('@$@$@$@$@$', 3),
+    ('za ٣Z ', 3),  # unicode digit, also a special character
+    ('²a', 1),  # superscript, not a decimal digit
+    ('\u212a1', 2),  # Kelvin sign lowers to 'k'
 ])
 def test_password_complexity(arg, expected):
     assert password_complexity(arg) == expected
\ No newline at end of file
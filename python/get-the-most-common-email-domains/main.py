@@ -7,11 +7,15 @@ COMMON_DOMAINS = ("https://bites-data.s3.us-east-2.amazonaws.com/"
                   "common-domains.html")
 TARGET_DIV = {"class": "middle_info_noborder"}
 
+# reuse the same connection across calls instead of a new handshake each time
+_SESSION = requests.Session()
+
 
 def get_common_domains(url=COMMON_DOMAINS):
     """Scrape the url return the 100 most common domain names"""
-    resp = requests.get(url)
-    soup = bs4.BeautifulSoup(resp.text, "html.parser")
+    resp = _SESSION.get(url, timeout=10)
+    # lxml parses in C and detects the encoding from the raw bytes itself
+    soup = bs4.BeautifulSoup(resp.content, "lxml")
     trs = soup.find("div", TARGET_DIV).find_all('tr')
     return [tr.find_all("td")[2].text for tr in trs]
 
@@ -23,14 +27,12 @@ def get_most_common_domains(emails, common_domains=None):
         common_domains = get_common_domains()
 
     # for multiple lookups a set is faster
-    common_domains = set(common_domains)
+    common_domains = frozenset(map(str.lower, common_domains))
 
-    domains = Counter()
-    for email in emails:
-        name, domain = email.split('@')
-        domain = domain.lower()
-        if domain in common_domains:
-            continue
-        domains[domain] += 1
+    # let Counter consume the generator directly, it counts in C
+    domains = (email.rpartition('@')[2].lower() for email in emails)
+    counts = Counter(
+        domain for domain in domains if domain not in common_domains
+    )
 
-    return domains.most_common()
+    return counts.most_common()
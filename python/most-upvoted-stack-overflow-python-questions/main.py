@@ -5,6 +5,9 @@ from bs4 import BeautifulSoup
 
 cached_so_url = "https://bites-data.s3.us-east-2.amazonaws.com/so_python.html"
 
+# a shared session keeps the connection alive between calls
+_SESSION = requests.Session()
+
 
 def top_python_questions(url=cached_so_url):
     """Use requests to retrieve the url / html,
@@ -13,16 +16,17 @@ def top_python_questions(url=cached_so_url):
        Return a list of (question, num_votes) tuples ordered
        by num_votes descending (see tests for expected output).
     """
-    resp = requests.get(url)
-    soup = BeautifulSoup(resp.text, "html.parser")
+    resp = _SESSION.get(url, timeout=10)
+    # lxml parses in C and detects the encoding from the raw bytes itself
+    soup = BeautifulSoup(resp.content, "lxml")
 
-    questions = soup.select(".question-summary")
+    questions = soup.find_all(class_="question-summary")
     res = []
 
     for que in questions:
-        question = que.select_one('.question-hyperlink')
-        votes = que.select_one('.vote-count-post')
-        views =  que.select_one('.views')
+        question = que.find(class_='question-hyperlink')
+        votes = que.find(class_='vote-count-post')
+        views = que.find(class_='views')
 
         if not (question and votes and views):
             continue
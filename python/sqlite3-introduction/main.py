@@ -1,6 +1,9 @@
 import sqlite3
+from collections.abc import Sequence
+from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 
 class SQLiteType(Enum):
@@ -30,6 +33,75 @@ class SchemaError(Exception):
     pass
 
 
+# operators accepted in the WHERE clause of select()
+_OPERATORS = frozenset(
+    {"=", "==", "!=", "<>", "<", "<=", ">", ">=", "LIKE", "GLOB", "IS", "IS NOT"}
+)
+
+
+def _select_sql(
+    table: str,
+    columns: Optional[Tuple[str, ...]],
+    target_column: Optional[str],
+    operator: Optional[str],
+) -> str:
+    """Builds a SELECT statement.
+
+    Args:
+        table (str): The table's name.
+        columns (tuple, optional): The column names to retrieve, None for all.
+        target_column (str, optional): The column of the WHERE clause, None for
+            no WHERE clause.
+        operator (str, optional): The operator of the WHERE clause.
+
+    Returns:
+        str: The SQL statement with a single placeholder for the target value.
+    """
+    sql = "SELECT " + ", ".join(columns or ("*",)) + f" FROM {table}"
+
+    if target_column is not None:
+        sql += f" WHERE {target_column} {operator} ?"
+
+    return sql
+
+
+def _row_validator(
+    table: str, schema: List[Tuple[str, SQLiteType]]
+) -> Callable[[Tuple], Tuple]:
+    """Builds a function that checks a single row against a table schema.
+
+    The column count and the column types are resolved once here, instead of
+    on every insert.
+
+    Args:
+        table (str): The table's name.
+        schema (list): A list of columns and their SQLite data types.
+
+    Returns:
+        callable: Takes a row and returns it unchanged if it respects the schema.
+            Raises a SchemaError otherwise.
+    """
+    expected = len(schema)
+    types = tuple(type_.value for _, type_ in schema)
+
+    def validate(row: Tuple) -> Tuple:
+        if len(row) != expected:
+            raise SchemaError(f"Table {table} expects items with {expected} values.")
+
+        # map runs isinstance over the whole row in C, the per-column loop only
+        # runs to report which column does not respect the schema
+        if not all(map(isinstance, row, types)):
+            for v, (name, type_) in zip(row, schema):
+                if not isinstance(v, type_.value):
+                    raise SchemaError(
+                        f"Column {name} expects values of type {type_.value.__name__}."
+                    )
+
+        return row
+
+    return validate
+
+
 class DB:
     """SQLite Database class.
 
@@ -47,24 +119,144 @@ class DB:
         table_schemas (dict): The table schemas of the database.
             The key is the table name and the value is a list of pairs of
             column name and column type.
+        readonly (bool): Open the database in read-only mode.
+        shared_cache (bool): Share the page cache with the other shared-cache
+            connections to the same database, for example to open an in-memory
+            database more than once. These connections lock whole tables: while
+            one of them is in a transaction, and every insert() is, the others
+            fail at once with "database table is locked" (SQLITE_LOCKED), as
+            busy_timeout only applies to file locks. For one writer and several
+            concurrent readers, open a database file with a separate connection
+            each and no shared cache instead, in WAL mode the readers see the
+            last commit while the writer's transaction is open.
+
+    The SQL statements are built once per table, columns and operator and then
+    reused, so the exact same string reaches sqlite3 and hits its statement cache.
+    Table and column names are interpolated into the SQL, so before a statement
+    is built they are checked against the table schemas. Only those names are
+    accepted. Tables that already exist in the database are read from it the
+    first time they are used.
+
+    The connection runs in autocommit mode, use transaction() to group
+    several statements in a single transaction.
     """
 
-    def __init__(self, location: Optional[str] = ":memory:"):
+    # applied on every new connection, tuned for many small writes
+    _PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=memory",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(
+        self,
+        location: Optional[str] = ":memory:",
+        readonly: bool = False,
+        shared_cache: bool = False,
+    ):
         self.location: str = location
+        self.readonly: bool = readonly
+        self.shared_cache: bool = shared_cache
 
         self.connection: sqlite3.Connection = None
         self.cursor: sqlite3.Cursor = None
         self.table_schemas: Dict[str, List[Tuple[str, SQLiteType]]] = {}
 
+        self._sql_cache: Dict[Tuple, str] = {}
+        self._validators: Dict[str, Callable[[Tuple], Tuple]] = {}
+        self._savepoint_depth: int = 0
+        # tables registered by the open transaction, forgotten if it rolls back
+        self._registered: List[str] = []
+
     def __enter__(self):
-        self.connection = sqlite3.connect(self.location)
+        database, uri = self.location, False
+        if self.readonly or self.shared_cache:
+            options = []
+            if self.shared_cache:
+                options.append("cache=shared")
+            if self.readonly:
+                options.append("mode=ro")
+
+            # '?' and '#' in a file name would be read as URI delimiters
+            path = self.location
+            if path != ":memory:":
+                path = quote(path)
+            database, uri = f"file:{path}?{'&'.join(options)}", True
+
+        self.connection = sqlite3.connect(
+            database,
+            uri=uri,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=512,
+        )
         self.cursor = self.connection.cursor()
 
+        # an in-memory database has no journal file to switch to WAL
+        # and a read-only connection can't change the journal mode
+        if self.location != ":memory:" and not self.readonly:
+            self.cursor.execute("PRAGMA journal_mode=WAL")
+
+        for pragma in self._PRAGMAS:
+            self.cursor.execute(pragma)
+
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.connection.close()
 
+    @contextmanager
+    def transaction(self):
+        """Runs the statements of the with block in a single transaction.
+
+        Commits when the block completes and rolls back if it raises.
+        The write lock is taken immediately, so a concurrent writer makes
+        BEGIN wait for busy_timeout instead of failing later on in the block.
+        Readers with their own connection are not blocked in WAL mode, while
+        readers sharing the cache with the writer fail until it commits.
+
+        Transactions can be nested. An inner block runs under a SAVEPOINT, if it
+        raises only its own changes are rolled back, so an outer block that
+        catches the error can still commit the rest. Only the outermost block
+        commits. Tables created in a block that is rolled back are removed from
+        table_schemas as well.
+
+        Example:
+            with db.transaction():
+                db.insert("ninjas", [("taspotts", 906)])
+                db.update("ninjas", ("bitecoins", 907), ("ninja", "taspotts"))
+                db.delete("ninjas", ("ninja", "Tomade"))
+        """
+        if self.connection.in_transaction:
+            self._savepoint_depth += 1
+            savepoint = f"nested_{self._savepoint_depth}"
+            registered = len(self._registered)
+            self.cursor.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield self
+            except BaseException:
+                self.cursor.execute(f"ROLLBACK TO {savepoint}")
+                self.cursor.execute(f"RELEASE {savepoint}")
+                self._unregister(registered)
+                raise
+            else:
+                self.cursor.execute(f"RELEASE {savepoint}")
+            finally:
+                self._savepoint_depth -= 1
+            return
+
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            self.cursor.execute("ROLLBACK")
+            self._unregister(0)
+            raise
+        else:
+            self.cursor.execute("COMMIT")
+            self._registered.clear()
+
     def create(
         self, table: str, schema: List[Tuple[str, SQLiteType]], primary_key: str
     ):
@@ -89,22 +281,103 @@ class DB:
         Raises:
             SchemaError: If the given primary key is not part of the schema.
         """
-        if primary_key not in (e[0] for e in schema):
-            raise SchemaError("The provided primary key must be part of the schema.")
+        sql = self._create_sql(table, schema, primary_key)
+        self._execute(sql)
+        self._register(table, schema)
 
-        self.table_schemas[table] = schema
+    def create_many(self, schemas: Dict[str, Tuple[List[Tuple[str, SQLiteType]], str]]):
+        """Creates several tables in a single transaction.
+
+        Either all the tables are created or none of them is, and the
+        tables are only registered once every CREATE TABLE succeeded.
+
+        Args:
+            schemas (dict): The key is the table's name and the value is a pair
+                of schema and primary key, as they are passed to create().
+                Example: {"cars": ([("make", SQLiteType.TEXT)], "make")}.
+
+        Raises:
+            SchemaError: If a primary key is not part of its schema.
+                No table is created in that case.
+            sqlite3.OperationalError: If a table can't be created,
+                e.g. because it already exists. No table is created either.
+        """
+        statements = [
+            self._create_sql(table, schema, primary_key)
+            for table, (schema, primary_key) in schemas.items()
+        ]
+        with self.transaction():
+            for sql in statements:
+                self._execute(sql)
+
+        for table, (schema, _) in schemas.items():
+            self._register(table, schema)
+
+    def _create_sql(
+        self, table: str, schema: List[Tuple[str, SQLiteType]], primary_key: str
+    ) -> str:
+        """Builds the CREATE TABLE statement of a table.
+
+        Args:
+            table (str): The table's name.
+            schema (list): A list of columns and their SQLite data types.
+            primary_key (str): The primary key column of the provided schema.
 
+        Returns:
+            str: The CREATE TABLE statement.
+
+        Raises:
+            SchemaError: If the given primary key is not part of the schema.
+        """
+        # validate the primary key while building the column definitions
+        found_pk = False
         columns = []
         for name, type_ in schema:
             column = f"{name} {type_.name}"
 
             if name == primary_key:
                 column = f"{column} primary key"
+                found_pk = True
 
             columns.append(column)
 
-        sql = f"CREATE TABLE {table} ({', '.join(columns)})"
-        self._execute(sql)
+        if not found_pk:
+            raise SchemaError("The provided primary key must be part of the schema.")
+
+        return f"CREATE TABLE {table} ({', '.join(columns)})"
+
+    def _register(self, table: str, schema: List[Tuple[str, SQLiteType]]):
+        """Stores the schema of a new table with its INSERT statement and validator.
+
+        Args:
+            table (str): The table's name.
+            schema (list): A list of columns and their SQLite data types.
+        """
+        self.table_schemas[table] = schema
+
+        placeholders = ", ".join("?" * len(schema))
+        self._sql_cache[("insert", table)] = (
+            f"INSERT INTO {table} VALUES ({placeholders})"
+        )
+        self._validators[table] = _row_validator(table, schema)
+
+        if self.connection.in_transaction:
+            self._registered.append(table)
+
+    def _unregister(self, start: int):
+        """Forgets the tables registered by a transaction that was rolled back.
+
+        Args:
+            start (int): Index in the registered tables of the first table to
+                forget, the ones before it are kept.
+        """
+        for table in self._registered[start:]:
+            del self.table_schemas[table]
+            del self._validators[table]
+            for key in [key for key in self._sql_cache if key[1] == table]:
+                del self._sql_cache[key]
+
+        del self._registered[start:]
 
     def delete(self, table: str, target: Tuple[str, Any]):
         """Deletes rows from the table.
@@ -115,12 +388,20 @@ class DB:
                 of the column name and the actual value. For example, if you
                 wanted to remove the row(s) with the year 1999, you would pass it
                 ("year", 1999). Only supports "=" operator in this bite.
+
+        Raises:
+            SchemaError: If the table or a column is not part of the known schemas.
         """
-        sql = f"DELETE FROM {table} WHERE {target[0]}= ?"
+        key = ("delete", table, target[0])
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            self._check_identifiers(table, (target[0],))
+            sql = self._sql_cache[key] = f"DELETE FROM {table} WHERE {target[0]}= ?"
+
         params = (target[1],)
         self._execute(sql, params)
 
-    def insert(self, table: str, values: List[Tuple]):
+    def insert(self, table: str, values: Iterable[Tuple]):
         """Inserts one or multiple new records into the database.
 
         Before inserting a value, you should make sure
@@ -139,36 +420,35 @@ class DB:
 
         Args:
             table (str): The table's name.
-            values (list): A list of values to insert.
+            values (iterable): A list, or any iterable, of values to insert.
                 Values must respect the table schema.
                 The tuple consists of the values for each column in the table.
                 Example: [("VW", 2001), ("Tesla", 2020)]
+                A list or tuple is validated as a whole before anything is
+                written. Any other iterable is validated and written one row at
+                a time, so a generator is never materialized in memory. If a
+                row is rejected, the rows before it are rolled back, also when
+                insert() runs inside an outer transaction() block.
 
         Raises:
-            SchemaError: If a value does not respect the table schema or
-                if there are more values than columns for the given table.
+            SchemaError: If the table does not exist, if a value does not respect
+                the table schema or if there are more values than columns for
+                the given table.
         """
-        table_schema = self.table_schemas[table]
-
-        values_mismatch = any(
-            x != y for x, y in zip(map(len, table_schema), map(len, values))
-        )
+        validate = self._validators.get(table)
+        if validate is None:
+            self._schema(table)
+            validate = self._validators[table]
 
-        if values_mismatch:
-            raise SchemaError(
-                f"Table {table} expects items with {len(table_schema)} values."
-            )
-
-        for entry in values:
-            for v, (name, type_) in zip(entry, table_schema):
-                if not isinstance(v, type_.value):
-                    raise SchemaError(
-                        f"Column {name} expects values of type {type_.value.__name__}."
-                    )
+        # rows that are already in memory are checked before writing any of them
+        rows = map(validate, values)
+        if isinstance(values, Sequence):
+            rows = list(rows)
 
-        placeholders = ", ".join("?" * len(table_schema))
-        sql = f"INSERT INTO {table} VALUES ({placeholders})"
-        self.cursor.executemany(sql, values)
+        # all the rows are written in a single transaction, not one each
+        with self.transaction():
+            sql = self._sql_cache[("insert", table)]
+            self.cursor.executemany(sql, rows)
 
     def select(
         self,
@@ -192,20 +472,38 @@ class DB:
 
         Returns:
             list: The output returned from the sql command
-        """
-        columns = ["*"] if columns is None else columns
 
-        sql = "SELECT " + ", ".join(columns) + f" FROM {table}"
-        params = tuple()
+        Raises:
+            SchemaError: If the table or a column is not part of the known schemas.
+            ValueError: If the target operator is not supported.
+        """
+        # lists are not hashable, the SQL cache key needs a tuple
+        columns = None if columns is None else tuple(columns)
 
         if target:
             if len(target) == 2:
                 target = (target[0], "=", target[1])
 
-            sql += f" WHERE {target[0]} {target[1]} ?"
-            params = (target[2],)
+            target_column, operator, value = target
+            params = (value,)
+        else:
+            target_column, operator = None, None
+            params = tuple()
 
-        return self._execute(sql, params)
+        key = ("select", table, columns, target_column, operator)
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            identifiers = columns or ()
+            if target:
+                if operator.upper() not in _OPERATORS:
+                    raise ValueError(f"Unsupported operator {operator}.")
+                identifiers += (target_column,)
+
+            self._check_identifiers(table, identifiers)
+            sql = _select_sql(table, columns, target_column, operator)
+            self._sql_cache[key] = sql
+
+        return self._execute_all(sql, params)
 
     def update(self, table: str, new_value: Tuple[str, Any], target: Tuple[str, Any]):
         """Update a record in the database.
@@ -215,14 +513,81 @@ class DB:
             new_value (tuple): The new value that you want to enter. For example,
                 if you wanted to change "year" to 2001 you would pass it ("year", 2001).
             target (tuple): The row/record to modify. Example ("year", 1991)
+
+        Raises:
+            SchemaError: If the table or a column is not part of the known schemas.
         """
-        sql = f"UPDATE {table} SET {new_value[0]}= ? WHERE {target[0]}= ?"
+        key = ("update", table, new_value[0], target[0])
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            self._check_identifiers(table, (new_value[0], target[0]))
+            sql = f"UPDATE {table} SET {new_value[0]}= ? WHERE {target[0]}= ?"
+            self._sql_cache[key] = sql
+
         params = (new_value[1], target[1])
         self._execute(sql, params)
 
-    def _execute(self, sql: str, params: Optional[Tuple] = None) -> List[Tuple]:
+    def _check_identifiers(self, table: str, columns: Tuple[str, ...]):
+        """Makes sure a table and its columns exist before they are put in SQL.
+
+        Args:
+            table (str): The table's name.
+            columns (tuple): The column names, "*" stands for all of them.
+
+        Raises:
+            SchemaError: If the table does not exist or
+                if a column is not part of its schema.
+        """
+        known = {name for name, _ in self._schema(table)}
+        for column in columns:
+            if column != "*" and column not in known:
+                raise SchemaError(f"Column {column} is not part of table {table}.")
+
+    def _schema(self, table: str) -> List[Tuple[str, SQLiteType]]:
+        """Returns the schema of a table, reading it from the database if needed.
+
+        Tables that were not created over this connection, e.g. the ones of a
+        database file that is opened again, are loaded once from
+        PRAGMA table_info and registered as if they were created with create().
+
+        Args:
+            table (str): The table's name.
+
+        Returns:
+            list: The columns of the table and their SQLite data types.
+
+        Raises:
+            SchemaError: If the table does not exist or
+                if a column has a type that is not part of SQLiteType.
+        """
+        schema = self.table_schemas.get(table)
+        if schema is not None:
+            return schema
+
+        # the table name is bound as a parameter, it is never put in the SQL
+        columns = self._execute_all(
+            "SELECT name, type FROM pragma_table_info(?)", (table,)
+        )
+        if not columns:
+            raise SchemaError(f"Table {table} does not exist.")
+
+        schema = []
+        for name, type_ in columns:
+            if type_.upper() not in SQLiteType.__members__:
+                raise SchemaError(
+                    f"Column {name} of table {table} has unsupported type {type_}."
+                )
+            schema.append((name, SQLiteType[type_.upper()]))
+
+        self._register(table, schema)
+        return schema
+
+    def _execute(self, sql: str, params: Optional[Tuple] = None) -> sqlite3.Cursor:
         """Executes a SQL command with optional parameters.
 
+        Nothing is fetched, statements that return no rows don't pay for it
+        and queries can stream their rows from the returned cursor.
+
         Args:
             sql (str): SQL command to execute
             params (tuple, optional): It is common convention to pass variables into
@@ -230,19 +595,56 @@ class DB:
                 Defaults to None.
 
         Returns:
-            (List): Fetches all (remaining) rows of a query result, returning a list.
-                An empty list is returned when no rows are available.
+            (sqlite3.Cursor): The cursor, iterate over it to get the result rows.
         """
         params = tuple() if params is None else params
-        self.cursor.execute(sql, params)
+        return self.cursor.execute(sql, params)
+
+    def _execute_all(self, sql: str, params: Optional[Tuple] = None) -> List[Tuple]:
+        """Executes a SQL command with optional parameters and fetches its rows.
 
-        return self.cursor.fetchall()
+        Args:
+            sql (str): SQL command to execute
+            params (tuple, optional): Parameters of the SQL command.
+                Defaults to None.
+
+        Returns:
+            (List): Fetches all (remaining) rows of a query result, returning a list.
+                An empty list is returned when no rows are available.
+        """
+        return self._execute(sql, params).fetchall()
 
     @property
     def num_transactions(self) -> int:
         """The total number of changes since the database connection was opened.
 
+        Rows written and then rolled back are counted too. This happens when
+        insert() rejects a row of an iterator after writing the rows before it,
+        or when a transaction() block raises.
+
         Returns:
             int: Returns the total number of database rows that have been modified.
         """
         return self.connection.total_changes
+
+
+if __name__ == "__main__":
+    # both tables are created in a single transaction
+    with DB() as db:
+        db.create_many(
+            {
+                "ninjas": (
+                    [("ninja", SQLiteType.TEXT), ("bitecoins", SQLiteType.INTEGER)],
+                    "ninja",
+                ),
+                "cities": (
+                    [("name", SQLiteType.TEXT), ("population", SQLiteType.INTEGER)],
+                    "name",
+                ),
+            }
+        )
+        db.insert("ninjas", [("taspotts", 906), ("Tomade", 896)])
+        db.insert("cities", [("Rome", 2_800_000)])
+
+        print(db.select("ninjas"))
+        print(db.select("cities"))
@@ -30,6 +30,65 @@ def test_empty_db():
     assert db.table_schemas == {}
 
 
+def test_shared_cache():
+    with DB(shared_cache=True) as writer, DB(shared_cache=True) as reader:
+        writer.create("ninjas", DB_SCHEMA, "ninja")
+        writer.insert("ninjas", NINJAS)
+
+        assert reader.select("ninjas") == NINJAS
+
+        # shared-cache connections lock the table instead of waiting on it
+        with writer.transaction():
+            writer.delete("ninjas", ("ninja", "clamytoe"))
+            with pytest.raises(sqlite3.OperationalError) as e:
+                reader.select("ninjas")
+
+        assert "database table is locked" in str(e.value)
+
+
+def test_wal_reader_in_write_transaction(tmp_path):
+    location = str(tmp_path / "ninjas.db")
+    with DB(location) as writer, DB(location, readonly=True) as reader:
+        writer.create("ninjas", DB_SCHEMA, "ninja")
+        writer.insert("ninjas", NINJAS)
+
+        with writer.transaction():
+            writer.delete("ninjas", ("ninja", "clamytoe"))
+            assert reader.select("ninjas") == NINJAS
+
+        assert reader.select("ninjas") == [e for e in NINJAS if e[0] != "clamytoe"]
+
+
+def test_readonly_special_path(tmp_path):
+    location = str(tmp_path / "ninjas#1?.db")
+    with DB(location) as writer:
+        writer.create("ninjas", DB_SCHEMA, "ninja")
+        writer.insert("ninjas", NINJAS)
+
+    with DB(location, readonly=True) as reader:
+        assert reader.select("ninjas") == NINJAS
+
+    assert [path.name for path in tmp_path.glob("*.db")] == ["ninjas#1?.db"]
+
+
+def test_reopen_database(tmp_path):
+    location = str(tmp_path / "ninjas.db")
+    with DB(location) as db:
+        db.create("ninjas", DB_SCHEMA, "ninja")
+        db.insert("ninjas", NINJAS)
+
+    with DB(location) as db:
+        db.delete("ninjas", ("ninja", "clamytoe"))
+        db.update("ninjas", ("bitecoins", 1000), ("ninja", "Tomade"))
+        db.insert("ninjas", [("bob", 906)])
+        with pytest.raises(SchemaError):
+            db.insert("ninjas", [("alice", "906")])
+
+        assert db.table_schemas == {"ninjas": DB_SCHEMA}
+        assert db.select("ninjas", target=("ninja", "Tomade")) == [("Tomade", 1000)]
+        assert len(db.select("ninjas")) == len(NINJAS)
+
+
 @pytest.mark.parametrize(
     "table, schema, pk",
     [
@@ -49,6 +108,74 @@ def test_create(table, schema, pk):
         assert db.num_transactions == 0
 
 
+def test_create_many():
+    schemas = {
+        "city": ([("name", SQLiteType.TEXT), ("population", SQLiteType.REAL)], "name"),
+        "ninjas": (DB_SCHEMA, "ninja"),
+    }
+    with DB() as db:
+        db.create_many(schemas)
+        query = "SELECT name FROM sqlite_master WHERE type= 'table' ORDER BY name;"
+        assert db.cursor.execute(query).fetchall() == [("city",), ("ninjas",)]
+
+        db.insert("ninjas", NINJAS)
+        assert db.select("ninjas") == NINJAS
+
+
+def test_create_many_wrong_pk():
+    with DB() as db:
+        with pytest.raises(SchemaError):
+            db.create_many({"city": (DB_SCHEMA, "ninja"), "ninjas": (DB_SCHEMA, "ID")})
+
+        query = "SELECT name FROM sqlite_master WHERE type= 'table';"
+        assert db.cursor.execute(query).fetchall() == []
+        assert db.table_schemas == {}
+
+
+def test_create_many_partial_failure(db):
+    schemas = {
+        "city": ([("name", SQLiteType.TEXT)], "name"),
+        "ninjas": (DB_SCHEMA, "ninja"),
+    }
+    with pytest.raises(sqlite3.OperationalError):
+        db.create_many(schemas)
+
+    query = "SELECT name FROM sqlite_master WHERE type= 'table';"
+    assert db.cursor.execute(query).fetchall() == [("ninjas",)]
+    assert "city" not in db.table_schemas
+
+
+def test_create_many_in_transaction(db):
+    with pytest.raises(SchemaError):
+        with db.transaction():
+            db.delete("ninjas", ("ninja", "clamytoe"))
+            db.create_many({"city": ([("name", SQLiteType.TEXT)], "name")})
+            raise SchemaError("roll back the outer transaction")
+
+    query = "SELECT name FROM sqlite_master WHERE type= 'table';"
+    assert db.cursor.execute(query).fetchall() == [("ninjas",)]
+    assert db.select("ninjas") == NINJAS
+    assert "city" not in db.table_schemas
+
+    with pytest.raises(SchemaError) as e:
+        db.insert("city", [("Rome",)])
+    assert str(e.value) == "Table city does not exist."
+
+
+def test_create_in_nested_transaction(db):
+    with db.transaction():
+        db.create("town", [("name", SQLiteType.TEXT)], "name")
+        with pytest.raises(SchemaError):
+            with db.transaction():
+                db.create("city", [("name", SQLiteType.TEXT)], "name")
+                db.insert("city", [("Rome",)])
+                raise SchemaError("roll back the city table")
+
+    assert list(db.table_schemas) == ["ninjas", "town"]
+    with pytest.raises(SchemaError):
+        db.select("city")
+
+
 def test_no_table_twice(db):
     with pytest.raises(sqlite3.OperationalError) as e:
         db.create("ninjas", DB_SCHEMA, "ninja")
@@ -70,6 +197,15 @@ def test_insert(db):
     assert output == NINJAS
 
 
+def test_insert_generator():
+    with DB() as db:
+        db.create("ninjas", DB_SCHEMA, "ninja")
+        db.insert("ninjas", (ninja for ninja in NINJAS))
+
+        assert db.num_transactions == 4
+        assert db.select("ninjas") == NINJAS
+
+
 def test_insert_twice(db):
     with pytest.raises(sqlite3.IntegrityError) as e:
         db.insert("ninjas", NINJAS)
@@ -95,6 +231,23 @@ def test_incorrect_number_of_values_for_insert(db, table, bad_values, expected):
     assert str(e.value) == f"Table {table} expects items with {expected} values."
 
 
+def test_number_of_values_for_three_columns():
+    schema = [
+        ("name", SQLiteType.TEXT),
+        ("population", SQLiteType.INTEGER),
+        ("area", SQLiteType.REAL),
+    ]
+    with DB() as db:
+        db.create("city", schema, "name")
+        db.insert("city", [("Rome", 2_800_000, 1285.0)])
+        assert db.num_transactions == 1
+
+        with pytest.raises(SchemaError) as e:
+            db.insert("city", [("Paris", 2_100_000, 105.4), ("Berlin", 3_600_000)])
+
+    assert str(e.value) == "Table city expects items with 3 values."
+
+
 @pytest.mark.parametrize(
     "table, bad_values, col, expected",
     [
@@ -148,6 +301,33 @@ def test_select_operator(db, table, target, expected):
     assert rows == expected
 
 
+@pytest.mark.parametrize(
+    "table, col, target, expected",
+    [
+        ("cars", None, None, "Table cars does not exist."),
+        (
+            "ninjas",
+            ["ninja; DROP TABLE ninjas"],
+            None,
+            "Column ninja; DROP TABLE ninjas is not part of table ninjas.",
+        ),
+        ("ninjas", None, ("year", 1999), "Column year is not part of table ninjas."),
+    ],
+)
+def test_select_unknown_identifiers(db, table, col, target, expected):
+    with pytest.raises(SchemaError) as e:
+        db.select(table, col, target)
+
+    assert str(e.value) == expected
+
+
+def test_insert_unknown_table(db):
+    with pytest.raises(SchemaError) as e:
+        db.insert("cars", [("VW", 2001)])
+
+    assert str(e.value) == "Table cars does not exist."
+
+
 @pytest.mark.parametrize(
     "table, new_value, target, expected",
     [
@@ -163,6 +343,29 @@ def test_update_db(db, table, new_value, target, expected):
     assert rows == expected
 
 
+def test_nested_transaction_rollback(db):
+    with db.transaction():
+        db.delete("ninjas", ("ninja", "clamytoe"))
+        with pytest.raises(SchemaError):
+            with db.transaction():
+                db.update("ninjas", ("bitecoins", 1000), ("ninja", "Tomade"))
+                raise SchemaError("undo the update only")
+
+    assert db.select("ninjas") == [e for e in NINJAS if e[0] != "clamytoe"]
+
+
+def test_transaction_rollback(db):
+    with pytest.raises(SchemaError):
+        with db.transaction():
+            db.delete("ninjas", ("ninja", "clamytoe"))
+            with db.transaction():
+                db.update("ninjas", ("bitecoins", 1000), ("ninja", "Tomade"))
+            db.insert("ninjas", [("Bob", "1000")])
+
+    assert not db.connection.in_transaction
+    assert db.select("ninjas") == NINJAS
+
+
 @pytest.mark.parametrize(
     "table, target", [("ninjas", ("ninja", "clamytoe")), ("ninjas", ("bitecoins", 906))]
 )
@@ -170,3 +373,24 @@ def test_delete_db(db, table, target):
     db.delete(table, target)
     rows = db.select(table, target=target)
     assert rows == []
+
+
+def test_insert_rejected_row_changes(db):
+    rows = [("a", 1), ("b", 2), ("c", "bad")]
+    with pytest.raises(SchemaError):
+        db.insert("ninjas", rows)
+    assert db.num_transactions == 4
+
+    # a generator is streamed, the rows before the bad one are written first
+    with pytest.raises(SchemaError):
+        db.insert("ninjas", (row for row in rows))
+    assert db.num_transactions == 6
+    assert db.select("ninjas") == NINJAS
+
+
+def test_insert_rollback_in_transaction(db):
+    with db.transaction():
+        with pytest.raises(SchemaError):
+            db.insert("ninjas", [("a", 1), ("b", 2), ("c", "bad")])
+
+    assert db.select("ninjas") == NINJAS
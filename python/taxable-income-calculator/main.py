@@ -88,8 +88,10 @@
 
 
 # %%
+import math
 from dataclasses import dataclass, field
-from typing import List, NamedTuple
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
 
 Bracket = NamedTuple("Bracket", [("end", int), ("rate", float)])
 Taxed = NamedTuple("Taxed", [("amount", float), ("rate", float), ("tax", float)])
@@ -103,8 +105,37 @@ BRACKET = [
     Bracket(510_301, 0.37),
 ]
 
+
+@lru_cache(maxsize=32)
+def _bracket_limits(
+    bracket: Tuple[Bracket, ...]
+) -> Tuple[Tuple[float, float, float], ...]:
+    """Gives the lower limit, upper limit and rate of every bracket
+
+    Each bracket starts where the previous one ends,
+    the last bracket has no upper limit.
+    Cached, Taxes instances sharing a custom bracket compute its limits once.
+
+    Arguments:
+        bracket {Tuple[Bracket, ...]} -- The tax bracket, sorted by end
+
+    Returns:
+        Tuple[Tuple[float, float, float], ...] -- (floor, ceiling, rate) tuples
+    """
+    ends = [end for end, _ in bracket[:-1]]
+    rates = [rate for _, rate in bracket]
+    return tuple(zip([0] + ends, ends + [math.inf], rates))
+
+
+# almost every Taxes uses the default bracket, compute its limits only once
+_BRACKET_LIMITS = _bracket_limits(tuple(BRACKET))
+
+# the static parts of the reports, only the amounts are formatted per call
+_SUMMARY_HEADER = f"{'Summary Report':^34}\n{'=' * 34}\n"
+_BREAKDOWN_HEADER = f"{'Taxes Breakdown':^34}\n{'=' * 34}"
+
 # %%
-@dataclass
+@dataclass(slots=True)
 class Taxes:
     """Taxes class
 
@@ -116,6 +147,8 @@ class Taxes:
     income: float
     bracket: List[Bracket] = field(default_factory=lambda: BRACKET)
     tax_amounts: List[Taxed] = field(default_factory=list)
+    # the taxes owed, summed once and reused by every report line
+    _total: Optional[float] = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
         """Summary Report
@@ -131,12 +164,12 @@ class Taxes:
                  Taxes Owed:         4,658.50
                    Tax Rate:           11.65%
         """
-        desc = f"{'Summary Report':^34}\n"
-        desc += f"{'=' * 34}\n"
-        desc += f"{'Taxable Income':>15}: {self.income:16,.2f}\n"
-        desc += f"{'Taxes Owed':>15}: {self.taxes:16,.2f}\n"
-        desc += f"{'Tax Rate':>15}: {self.tax_rate:15.2f}%"
-        return desc
+        return (
+            f"{_SUMMARY_HEADER}"
+            f" Taxable Income: {self.income:16,.2f}\n"
+            f"     Taxes Owed: {self.taxes:16,.2f}\n"
+            f"       Tax Rate: {self.tax_rate:15.2f}%"
+        )
 
     def _record(self, amount: float, rate: float):
         """Helper function to record tax amounts and rates
@@ -151,53 +184,44 @@ class Taxes:
 
     def report(self):
         """Prints taxes breakdown report"""
-        desc = f"{str(self)}\n"
-        desc += f"\n{'Taxes Breakdown':^34}\n"
-        desc += f"{'=' * 34}\n"
-        for tax in self.tax_amounts:
-            desc += f"{tax.amount:12,.2f} x {tax.rate:4.2f} = {tax.tax:12,.2f}\n"
-        desc += f"{'-' * 34}\n"
-        desc += f"{'Total =':>21} {self.taxes:12,.2f}"
-        print(desc.rstrip())
+        lines = [str(self), "", _BREAKDOWN_HEADER]
+        lines.extend(
+            f"{tax.amount:12,.2f} x {tax.rate:4.2f} = {tax.tax:12,.2f}"
+            for tax in self.tax_amounts
+        )
+        lines.append("-" * 34)
+        lines.append(f"{'Total =':>21} {self.taxes:12,.2f}")
+        print("\n".join(lines))
 
     @property
     def taxes(self) -> float:
         """Calculates the taxes owed
 
         As it's calculating the taxes, it is also populating the tax_amounts list
-        which stores the Taxed named tuples.
+        which stores the Taxed named tuples. The result is cached, later calls
+        don't recompute it.
 
         Returns:
             float -- The amount of taxes owed
         """
+        if self._total is not None:
+            return self._total
+
         if not self.tax_amounts:
-            for n, b in enumerate(self.bracket):
-                # if the taxable income is less than the first bracket
-                # tax the income amount and break out of the loop
-                if n == 0:
-                    if self.income > b.end:
-                        self._record(b.end, b.rate)
-                    else:
-                        self._record(self.income, b.rate)
-                        break
-                # if we've gotten to the last bracket just tax the amount
-                # that's above it
-                elif n == len(self.bracket) - 1:
-                    amount = self.income - self.bracket[n - 1].end
-                    self._record(amount, b.rate)
-                else:
-                    # check to see if the taxable income is below the end
-                    # of the current bracket and tax that amount
-                    if self.income <= b.end:
-                        amount = self.income - self.bracket[n - 1].end
-                    else:
-                        amount = b.end - self.bracket[n - 1].end
-                    self._record(amount, b.rate)
-                    # if the taxable income is below the end of the current
-                    # bracket break out of the loop
-                    if self.income <= b.end:
-                        break
-        return self.total
+            if self.bracket is BRACKET:
+                limits = _BRACKET_LIMITS
+            else:
+                limits = _bracket_limits(tuple(self.bracket))
+
+            income = self.income
+            for floor, ceiling, rate in limits:
+                self._record(min(income, ceiling) - floor, rate)
+                # brackets are sorted, none of the next ones is reached
+                if income <= ceiling:
+                    break
+
+        self._total = round(sum(t.tax for t in self.tax_amounts), 2)
+        return self._total
 
     @property
     def total(self) -> float:
@@ -206,11 +230,7 @@ class Taxes:
         Returns:
             float -- Total taxes owed
         """
-        return (
-            round(sum(t.tax for t in self.tax_amounts), 2)
-            if self.tax_amounts
-            else self.taxes
-        )
+        return self.taxes
 
     @property
     def tax_rate(self) -> float:
@@ -219,7 +239,7 @@ class Taxes:
         Returns:
             float -- Tax rate
         """
-        return round((self.total / self.income) * 100, 2)
+        return round((self.taxes / self.income) * 100, 2)
 
 
 # %%